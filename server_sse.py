@@ -3,14 +3,32 @@ Oracle Fusion AR MCP Server
 SSE HTTP transport for Railway deployment.
 """
 
+from cachetools import LRUCache, TTLCache
 from mcp.server.fastmcp import FastMCP
-from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional
+from pydantic import AfterValidator, BaseModel, Field, ConfigDict
+from typing import Annotated, Optional
+import asyncio
+import certifi
 import httpx
-import json
+import ijson
+import numpy as np
+import orjson
 import base64
+import functools
+import hashlib
+import http.cookiejar
+import itertools
+import math
 import os
-from datetime import datetime, date
+import ssl
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from datetime import date
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # response caching is optional
+    redis = None
 
 # Initialize MCP server
 mcp = FastMCP("oracle_ar_mcp")
@@ -20,18 +38,36 @@ mcp = FastMCP("oracle_ar_mcp")
 # Input Models
 # ============================================================================
 
+# Inputs are validated once by FastMCP and only read afterwards.
+_INPUT_CONFIG = ConfigDict(str_strip_whitespace=True, frozen=True, revalidate_instances="never", extra="ignore")
+
+
+def _check_base_url(value: str) -> str:
+    """Reject anything that is not an absolute http(s) URL and normalize it before it keys a client pool."""
+    try:
+        url = httpx.URL(value)
+    except httpx.InvalidURL as e:
+        raise ValueError(f"Invalid base_url: {e}") from None
+    if url.scheme not in ("http", "https") or not url.host:
+        raise ValueError("base_url must be an absolute http(s) URL")
+    return str(url.copy_with(query=None, fragment=None)).rstrip("/")
+
+
+_BaseUrl = Annotated[str, AfterValidator(_check_base_url)]
+
+
 class AuthInput(BaseModel):
-    model_config = ConfigDict(str_strip_whitespace=True)
-    base_url: str = Field(..., description="Oracle Fusion base URL")
+    model_config = _INPUT_CONFIG
+    base_url: _BaseUrl = Field(..., description="Oracle Fusion base URL")
     username: str = Field(..., description="Oracle Fusion username")
-    password: str = Field(..., description="Oracle Fusion password")
+    password: str = Field(..., description="Oracle Fusion password", repr=False)
 
 
 class InvoiceLookupInput(BaseModel):
-    model_config = ConfigDict(str_strip_whitespace=True)
-    base_url: str = Field(..., description="Oracle Fusion base URL")
+    model_config = _INPUT_CONFIG
+    base_url: _BaseUrl = Field(..., description="Oracle Fusion base URL")
     username: str = Field(..., description="Oracle Fusion username")
-    password: str = Field(..., description="Oracle Fusion password")
+    password: str = Field(..., description="Oracle Fusion password", repr=False)
     customer_account_id: Optional[str] = Field(default=None, description="Filter by customer account ID")
     invoice_number: Optional[str] = Field(default=None, description="Filter by invoice number")
     limit: int = Field(default=25, ge=1, le=500)
@@ -39,10 +75,10 @@ class InvoiceLookupInput(BaseModel):
 
 
 class ReceiptLookupInput(BaseModel):
-    model_config = ConfigDict(str_strip_whitespace=True)
-    base_url: str = Field(..., description="Oracle Fusion base URL")
+    model_config = _INPUT_CONFIG
+    base_url: _BaseUrl = Field(..., description="Oracle Fusion base URL")
     username: str = Field(..., description="Oracle Fusion username")
-    password: str = Field(..., description="Oracle Fusion password")
+    password: str = Field(..., description="Oracle Fusion password", repr=False)
     customer_account_id: Optional[str] = Field(default=None, description="Filter by customer account ID")
     receipt_number: Optional[str] = Field(default=None, description="Filter by receipt number")
     limit: int = Field(default=25, ge=1, le=500)
@@ -50,18 +86,26 @@ class ReceiptLookupInput(BaseModel):
 
 
 class CustomerSummaryInput(BaseModel):
-    model_config = ConfigDict(str_strip_whitespace=True)
-    base_url: str = Field(..., description="Oracle Fusion base URL")
+    model_config = _INPUT_CONFIG
+    base_url: _BaseUrl = Field(..., description="Oracle Fusion base URL")
     username: str = Field(..., description="Oracle Fusion username")
-    password: str = Field(..., description="Oracle Fusion password")
+    password: str = Field(..., description="Oracle Fusion password", repr=False)
     customer_account_id: str = Field(..., description="Customer account ID")
 
 
+class CustomerSummariesInput(BaseModel):
+    model_config = _INPUT_CONFIG
+    base_url: _BaseUrl = Field(..., description="Oracle Fusion base URL")
+    username: str = Field(..., description="Oracle Fusion username")
+    password: str = Field(..., description="Oracle Fusion password", repr=False)
+    customer_account_ids: list[str] = Field(..., min_length=1, max_length=50, description="Customer account IDs")
+
+
 class AgingInput(BaseModel):
-    model_config = ConfigDict(str_strip_whitespace=True)
-    base_url: str = Field(..., description="Oracle Fusion base URL")
+    model_config = _INPUT_CONFIG
+    base_url: _BaseUrl = Field(..., description="Oracle Fusion base URL")
     username: str = Field(..., description="Oracle Fusion username")
-    password: str = Field(..., description="Oracle Fusion password")
+    password: str = Field(..., description="Oracle Fusion password", repr=False)
     customer_account_id: Optional[str] = Field(default=None)
     limit: int = Field(default=25, ge=1, le=500)
     offset: int = Field(default=0, ge=0)
@@ -71,31 +115,369 @@ class AgingInput(BaseModel):
 # Helpers
 # ============================================================================
 
+def _dumps(obj) -> str:
+    # Compact output: tool results are read by the model, so indentation only costs bytes and tokens.
+    return orjson.dumps(obj).decode()
+
+
 def _build_auth_header(username: str, password: str) -> str:
     credentials = f"{username}:{password}"
     encoded = base64.b64encode(credentials.encode()).decode()
     return f"Basic {encoded}"
 
 
-async def _make_request(base_url: str, auth_header: str, endpoint: str, params: dict = None) -> dict:
-    url = f"{base_url.rstrip('/')}/fscmRestApi/resources/11.13.18.05/{endpoint}"
-    async with httpx.AsyncClient(timeout=60.0, verify=False) as client:
-        response = await client.get(url, headers={"Authorization": auth_header, "Content-Type": "application/json"}, params=params or {})
-        response.raise_for_status()
-        return response.json()
+@dataclass(slots=True, frozen=True)
+class _RequestContext:
+    """Oracle target and credentials for one tool call, passed to every request helper."""
+    base_url: str
+    auth_header: str = field(repr=False)
+    credentials_digest: str
 
 
-def _handle_error(e: Exception) -> str:
+def _request_context(params: BaseModel) -> _RequestContext:
+    # Built per call rather than memoized: any cache entry able to produce the Authorization
+    # header would keep the password, in reversible form, for the life of the process.
+    digest = hashlib.blake2b(f"{params.username}:{params.password}".encode(), digest_size=16).hexdigest()
+    return _RequestContext(params.base_url, _build_auth_header(params.username, params.password), digest)
+
+
+# Tool responses are cached in Redis when REDIS_URL is set, otherwise in this process. A TTL of 0
+# disables caching, so Redis is not contacted at all (it refuses SET with EX 0).
+_CACHE_TTL = int(os.environ.get("AR_MCP_CACHE_TTL", 60))
+_CACHE = None
+if redis and os.environ.get("REDIS_URL") and _CACHE_TTL > 0:
+    # Short timeouts so an unresponsive Redis degrades to uncached calls instead of hanging every tool.
+    _CACHE = redis.from_url(os.environ["REDIS_URL"], decode_responses=True, socket_timeout=0.5, socket_connect_timeout=0.5)
+_LOCAL_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=_CACHE_TTL)
+
+
+def _cache_key(tool: str, ctx: _RequestContext, params: BaseModel) -> str:
+    material = f"{tool}:{params.model_dump_json(exclude={'username', 'password'})}:{ctx.credentials_digest}"
+    return f"oracle_ar:{hashlib.blake2b(material.encode()).hexdigest()}"
+
+
+async def _cache_get(key: str) -> Optional[str]:
+    if _CACHE is None:
+        return _LOCAL_CACHE.get(key)
+    try:
+        return await _CACHE.get(key)
+    except redis.RedisError:
+        return None
+
+
+async def _cache_set(key: str, value: str) -> str:
+    if _CACHE is None:
+        _LOCAL_CACHE[key] = value
+        return value
+    try:
+        await _CACHE.set(key, value, ex=_CACHE_TTL)
+    except redis.RedisError:
+        pass
+    return value
+
+
+@dataclass(slots=True)
+class _HostClients:
+    """A host's client shards and the number of requests currently using them."""
+    shards: tuple[httpx.AsyncClient, ...]
+    cycle: itertools.cycle
+    active: int = 0
+    evicted: bool = False
+
+    def close_later(self) -> None:
+        for client in self.shards:
+            task = asyncio.ensure_future(client.aclose())
+            _CLOSING.add(task)
+            task.add_done_callback(_CLOSING.discard)
+
+
+class _ClientCache(LRUCache):
+    """Per-host clients; an evicted host's clients are closed once its last in-flight request ends."""
+
+    def popitem(self):
+        key, entry = super().popitem()
+        entry.evicted = True
+        if not entry.active:
+            entry.close_later()
+        return key, entry
+
+
+# Pooled clients per Oracle host so TCP/TLS connections survive across tool calls. Sharding a host over
+# several clients only helps once AR_MCP_MAX_INFLIGHT exceeds the load balancer's per-connection
+# HTTP/2 stream cap, so a single client per host is the default.
+# Hosts come from callers, so only the most recently used ones keep their pools.
+_CLIENTS = _ClientCache(maxsize=32)
+_CLOSING: set[asyncio.Task] = set()
+_HTTP2_SHARDS = max(1, int(os.environ.get("AR_MCP_HTTP2_SHARDS", 1)))
+_REST_PREFIX = "/fscmRestApi/resources/11.13.18.05/"
+_JSON_HEADERS_TEMPLATE = {"Content-Type": "application/json"}
+# Columns requested when a tool does not narrow them further.
+_DEFAULT_FIELDS = {
+    "receivablesInvoices": "TransactionNumber,BillToCustomerName,EnteredAmount,BalanceDue,DueDate,Status",
+    "standardReceipts": "ReceiptNumber,CustomerName,Amount,ReceiptDate,Status",
+}
+# Built once and shared by every client; set AR_MCP_VERIFY_SSL=false only for self-signed demo instances.
+_SSL_CONTEXT = ssl.create_default_context(cafile=certifi.where()) if os.environ.get("AR_MCP_VERIFY_SSL", "true").lower() not in ("0", "false", "no") else False
+# The per-host connection limits are divided across that host's shards, rounding up.
+_POOL_LIMITS = httpx.Limits(
+    max_connections=math.ceil(int(os.environ.get("AR_MCP_MAX_CONN", 100)) / _HTTP2_SHARDS),
+    max_keepalive_connections=math.ceil(int(os.environ.get("AR_MCP_KEEPALIVE", 50)) / _HTTP2_SHARDS),
+    keepalive_expiry=60.0,
+)
+
+
+def _new_client() -> httpx.AsyncClient:
+    client = httpx.AsyncClient(
+        headers=_JSON_HEADERS_TEMPLATE,
+        # Fail fast on unreachable hosts while still allowing slow Oracle queries to finish.
+        timeout=httpx.Timeout(60.0, connect=5.0),
+        # retries covers connect-stage failures only (DNS, TCP, TLS), which are safe to repeat.
+        transport=httpx.AsyncHTTPTransport(http2=True, verify=_SSL_CONTEXT, limits=_POOL_LIMITS, retries=2),
+    )
+    # Every credential pair shares the host's clients, so no cookie may be stored: one caller's
+    # Oracle session cookie would otherwise authenticate the next caller's requests.
+    client.cookies.jar.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+    return client
+
+
+@contextmanager
+def _client_lease(base_url: str):
+    """Yield the next shard for a host, round-robin, keeping it open until the lease ends."""
+    entry = _CLIENTS.get(base_url)
+    if entry is None:
+        shards = tuple(_new_client() for _ in range(_HTTP2_SHARDS))
+        entry = _CLIENTS[base_url] = _HostClients(shards, itertools.cycle(shards))
+    entry.active += 1
+    try:
+        yield next(entry.cycle)
+    finally:
+        entry.active -= 1
+        if entry.evicted and not entry.active:
+            entry.close_later()
+
+
+@functools.lru_cache(maxsize=256)
+def _endpoint_url(base_url: str, endpoint: str) -> httpx.URL:
+    # Parsed once per (host, endpoint); an absolute URL also skips httpx's base_url merge on every request.
+    return httpx.URL(f"{base_url}{_REST_PREFIX}{endpoint}")
+
+
+async def _close_clients() -> None:
+    clients = [client for entry in _CLIENTS.values() for client in entry.shards]
+    _CLIENTS.clear()
+    for client in clients:
+        await client.aclose()
+    await asyncio.gather(*_CLOSING)
+    if _CACHE is not None:
+        await _CACHE.aclose()
+
+
+def _with_client_shutdown(lifespan):
+    """Wrap an ASGI lifespan so pooled clients are closed on server shutdown."""
+    @asynccontextmanager
+    async def wrapper(app):
+        try:
+            async with lifespan(app):
+                yield
+        finally:
+            await _close_clients()
+    return wrapper
+
+
+# Caps in-flight Oracle requests across all tools so concurrent fan-outs cannot trip throttling.
+_REQ_SEM = asyncio.Semaphore(int(os.environ.get("AR_MCP_MAX_INFLIGHT", 10)))
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_MAX_RETRIES = 3
+_MAX_RETRY_DELAY = 10.0
+
+
+def _retry_delay(response: httpx.Response, attempt: int) -> float:
+    retry_after = response.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        return min(float(retry_after), _MAX_RETRY_DELAY)
+    return 0.5 * 2 ** attempt
+
+
+@asynccontextmanager
+async def _send(ctx: _RequestContext, endpoint: str, params: dict = None):
+    """Send a GET and yield the unread response, backing off on throttling and transient server errors.
+
+    Each attempt holds a ``_REQ_SEM`` slot until the caller is done with the response; the slot is
+    released while backing off so throttled requests do not stall every other tool.
+    """
+    # onlyData drops the per-row links arrays, which outweigh the projected columns.
+    query = {"onlyData": "true"}
+    if endpoint in _DEFAULT_FIELDS:
+        query["fields"] = _DEFAULT_FIELDS[endpoint]
+    query.update(params or {})
+    with _client_lease(ctx.base_url) as client:
+        request = client.build_request("GET", _endpoint_url(ctx.base_url, endpoint), headers={"Authorization": ctx.auth_header}, params=query)
+        for attempt in range(_MAX_RETRIES + 1):
+            async with _REQ_SEM:
+                response = await client.send(request, stream=True)
+                try:
+                    if response.status_code not in _RETRY_STATUSES or attempt == _MAX_RETRIES:
+                        response.raise_for_status()
+                        yield response
+                        return
+                finally:
+                    await response.aclose()
+            await asyncio.sleep(_retry_delay(response, attempt))
+
+
+# Identical concurrent work is shared; entries live only while it is in flight. Tool calls are keyed
+# by cache key, which also covers streamed pages; buffered requests are keyed by their full query.
+_INFLIGHT_CALLS: dict[str, asyncio.Task] = {}
+_INFLIGHT_REQUESTS: dict[tuple, asyncio.Task] = {}
+
+
+def _shared(inflight: dict, key, start) -> asyncio.Future:
+    """Join the task running under ``key``, starting it with ``start()`` if there is none."""
+    task = inflight.get(key)
+    if task is None:
+        task = inflight[key] = asyncio.ensure_future(start())
+        task.add_done_callback(lambda _: inflight.pop(key, None))
+    # shield keeps one cancelled caller from cancelling the work the others are waiting on.
+    return asyncio.shield(task)
+
+
+async def _fetch(ctx: _RequestContext, endpoint: str, params: dict = None) -> dict:
+    async with _send(ctx, endpoint, params) as response:
+        return orjson.loads(await response.aread())
+
+
+async def _make_request(ctx: _RequestContext, endpoint: str, params: dict = None) -> dict:
+    """Fetch a JSON page, joining an identical request already in flight. Callers must not mutate the result."""
+    key = (ctx.credentials_digest, ctx.base_url, endpoint, tuple(sorted((params or {}).items())))
+    return await _shared(_INFLIGHT_REQUESTS, key, lambda: _fetch(ctx, endpoint, params))
+
+
+async def _cached_call(cache_key: str, run) -> str:
+    """Return the cached tool response, or join the one in-flight ``run()`` that produces it."""
+    if cached := await _cache_get(cache_key):
+        return cached
+    return await _shared(_INFLIGHT_CALLS, cache_key, run)
+
+
+class _AsyncByteReader:
+    """Adapt an httpx byte stream to the async ``read()`` interface ijson expects."""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._buffer = b""
+
+    async def read(self, size: int = -1) -> bytes:
+        if size == 0:
+            return b""
+        if not self._buffer:
+            self._buffer = await anext(self._chunks, b"")
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+async def _stream_items(ctx: _RequestContext, endpoint: str, params: dict = None):
+    """Yield collection items one at a time without materializing the whole response."""
+    async with _send(ctx, endpoint, params) as response:
+        async for item in ijson.items_async(_AsyncByteReader(response.aiter_bytes()), "items.item", use_float=True):
+            yield item
+
+
+async def _gather_or_cancel(*aws) -> list:
+    """Run ``aws`` concurrently like ``asyncio.gather``, but cancel the rest as soon as one fails.
+
+    The first failure is re-raised on its own so callers keep handling plain exceptions.
+    """
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(aw) for aw in aws]
+    except ExceptionGroup as eg:
+        raise eg.exceptions[0] from None
+    return [task.result() for task in tasks]
+
+
+async def _stream_all_items(ctx: _RequestContext, endpoint: str, params: dict, consume, page_size: int = 500) -> dict:
+    """Stream every page of a collection into ``consume``, fetching the pages concurrently.
+
+    A one-row probe for ``totalResults`` runs alongside the first page, so collections that
+    fit in one page cost a single round trip. The probe is returned so callers can read its
+    first item. Without ``totalResults`` in the probe, the remaining pages are fetched one by one
+    until ``hasMore`` is false.
+    """
+    async def consume_page(offset: int) -> int:
+        count = 0
+        async for item in _stream_items(ctx, endpoint, {**params, "limit": page_size, "offset": offset}):
+            consume(item)
+            count += 1
+        return count
+
+    probe, first_count = await _gather_or_cancel(
+        _make_request(ctx, endpoint, {**params, "limit": 1, "totalResults": "true"}),
+        consume_page(0),
+    )
+    if "totalResults" in probe:
+        await _gather_or_cancel(*(consume_page(offset) for offset in range(page_size, probe["totalResults"], page_size)))
+        return probe
+    offset, has_more = page_size, first_count == page_size
+    while has_more:
+        page = await _make_request(ctx, endpoint, {**params, "limit": page_size, "offset": offset})
+        for item in page.get("items", []):
+            consume(item)
+        offset, has_more = offset + page_size, page.get("hasMore", False)
+    return probe
+
+
+# Customers summarized at once by oracle_ar_get_customer_summaries.
+_SUMMARY_BATCH_CONCURRENCY = 4
+
+# (input attribute, Oracle field) pairs each list tool can filter on.
+_INVOICE_FILTERS = (("customer_account_id", "CustomerAccountId"), ("invoice_number", "TransactionNumber"))
+_RECEIPT_FILTERS = (("customer_account_id", "CustomerAccountId"), ("receipt_number", "ReceiptNumber"))
+_AGING_FILTERS = (("customer_account_id", "CustomerAccountId"),)
+
+# Lower bounds (days past due) of every bucket after "current"; np.digitize maps <= 0 days to index 0.
+_AGING_BOUNDS = (1, 31, 61, 91)
+_AGING_BUCKETS = ("current", "1_30", "31_60", "61_90", "over_90")
+
+
+def _with_filters(query_params: dict, params: BaseModel, filters: tuple, *fixed: str) -> dict:
+    """Add an Oracle ``q`` expression for every filter the caller supplied, plus any ``fixed`` terms."""
+    q = ";".join([*(f"{field}={value}" for attr, field in filters if (value := getattr(params, attr))), *fixed])
+    if q:
+        query_params["q"] = q
+    return query_params
+
+
+async def _customer_summary(ctx: _RequestContext, customer_account_id: str) -> dict:
+    amounts = []
+    balances = []
+
+    def add_invoice(inv: dict) -> None:
+        amounts.append(inv.get("EnteredAmount") or 0)
+        balances.append(inv.get("BalanceDue") or 0)
+
+    probe = await _stream_all_items(ctx, "receivablesInvoices", {"q": f"CustomerAccountId={customer_account_id}", "fields": "BillToCustomerName,EnteredAmount,BalanceDue"}, add_invoice)
+    first = probe.get("items", [])
+    customer_name = first[0].get("BillToCustomerName") if first else None
+    return {"customer_account_id": customer_account_id, "customer_name": customer_name, "total_invoiced": round(math.fsum(amounts), 2), "outstanding_balance": round(math.fsum(balances), 2), "invoice_count": len(amounts)}
+
+
+def _error_message(e: Exception) -> str:
     if isinstance(e, httpx.HTTPStatusError):
         status = e.response.status_code
         if status == 401:
-            return json.dumps({"error": "Authentication failed"})
+            return "Authentication failed"
         elif status == 403:
-            return json.dumps({"error": "Permission denied"})
+            return "Permission denied"
         elif status == 404:
-            return json.dumps({"error": "Resource not found"})
-        return json.dumps({"error": f"API error {status}"})
-    return json.dumps({"error": str(e)})
+            return "Resource not found"
+        return f"API error {status}"
+    return str(e)
+
+
+def _handle_error(e: Exception) -> str:
+    return _dumps({"error": _error_message(e)})
 
 
 # ============================================================================
@@ -105,108 +487,133 @@ def _handle_error(e: Exception) -> str:
 @mcp.tool(name="oracle_ar_test_connection")
 async def test_connection(params: AuthInput) -> str:
     """Test connection to Oracle Fusion."""
-    auth_header = _build_auth_header(params.username, params.password)
-    try:
-        async with httpx.AsyncClient(timeout=30.0, verify=False) as client:
-            url = f"{params.base_url.rstrip('/')}/fscmRestApi/resources/11.13.18.05/receivablesInvoices?limit=1"
-            response = await client.get(url, headers={"Authorization": auth_header})
-            response.raise_for_status()
-        return json.dumps({"status": "connected", "message": "Credentials valid"})
-    except Exception as e:
-        return _handle_error(e)
+    ctx = _request_context(params)
+    cache_key = _cache_key("oracle_ar_test_connection", ctx, params)
+
+    async def run() -> str:
+        try:
+            await _make_request(ctx, "receivablesInvoices", {"limit": 1})
+            return await _cache_set(cache_key, _dumps({"status": "connected", "message": "Credentials valid"}))
+        except Exception as e:
+            return _handle_error(e)
+
+    return await _cached_call(cache_key, run)
 
 
 @mcp.tool(name="oracle_ar_list_invoices")
 async def list_invoices(params: InvoiceLookupInput) -> str:
     """List AR invoices from Oracle Fusion."""
-    auth_header = _build_auth_header(params.username, params.password)
-    query_params = {"limit": params.limit, "offset": params.offset}
-    filters = []
-    if params.customer_account_id:
-        filters.append(f"CustomerAccountId={params.customer_account_id}")
-    if params.invoice_number:
-        filters.append(f"TransactionNumber={params.invoice_number}")
-    if filters:
-        query_params["q"] = ";".join(filters)
-    try:
-        data = await _make_request(params.base_url, auth_header, "receivablesInvoices", query_params)
-        invoices = [{"invoice_number": inv.get("TransactionNumber"), "customer_name": inv.get("BillToCustomerName"), "amount": inv.get("EnteredAmount"), "balance_due": inv.get("BalanceDue"), "due_date": inv.get("DueDate"), "status": inv.get("Status")} for inv in data.get("items", [])]
-        return json.dumps({"invoices": invoices, "count": len(invoices), "has_more": data.get("hasMore", False)}, indent=2)
-    except Exception as e:
-        return _handle_error(e)
+    ctx = _request_context(params)
+    cache_key = _cache_key("oracle_ar_list_invoices", ctx, params)
+
+    async def run() -> str:
+        query_params = _with_filters({"limit": params.limit, "offset": params.offset}, params, _INVOICE_FILTERS)
+        try:
+            data = await _make_request(ctx, "receivablesInvoices", query_params)
+            invoices = [{"invoice_number": inv.get("TransactionNumber"), "customer_name": inv.get("BillToCustomerName"), "amount": inv.get("EnteredAmount"), "balance_due": inv.get("BalanceDue"), "due_date": inv.get("DueDate"), "status": inv.get("Status")} for inv in data.get("items", [])]
+            return await _cache_set(cache_key, _dumps({"invoices": invoices, "count": len(invoices), "has_more": data.get("hasMore", False)}))
+        except Exception as e:
+            return _handle_error(e)
+
+    return await _cached_call(cache_key, run)
 
 
 @mcp.tool(name="oracle_ar_list_receipts")
 async def list_receipts(params: ReceiptLookupInput) -> str:
     """List payment receipts from Oracle Fusion."""
-    auth_header = _build_auth_header(params.username, params.password)
-    query_params = {"limit": params.limit, "offset": params.offset}
-    filters = []
-    if params.customer_account_id:
-        filters.append(f"CustomerAccountId={params.customer_account_id}")
-    if params.receipt_number:
-        filters.append(f"ReceiptNumber={params.receipt_number}")
-    if filters:
-        query_params["q"] = ";".join(filters)
-    try:
-        data = await _make_request(params.base_url, auth_header, "standardReceipts", query_params)
-        receipts = [{"receipt_number": r.get("ReceiptNumber"), "customer_name": r.get("CustomerName"), "amount": r.get("Amount"), "receipt_date": r.get("ReceiptDate"), "status": r.get("Status")} for r in data.get("items", [])]
-        return json.dumps({"receipts": receipts, "count": len(receipts), "has_more": data.get("hasMore", False)}, indent=2)
-    except Exception as e:
-        return _handle_error(e)
+    ctx = _request_context(params)
+    cache_key = _cache_key("oracle_ar_list_receipts", ctx, params)
+
+    async def run() -> str:
+        query_params = _with_filters({"limit": params.limit, "offset": params.offset}, params, _RECEIPT_FILTERS)
+        try:
+            data = await _make_request(ctx, "standardReceipts", query_params)
+            receipts = [{"receipt_number": r.get("ReceiptNumber"), "customer_name": r.get("CustomerName"), "amount": r.get("Amount"), "receipt_date": r.get("ReceiptDate"), "status": r.get("Status")} for r in data.get("items", [])]
+            return await _cache_set(cache_key, _dumps({"receipts": receipts, "count": len(receipts), "has_more": data.get("hasMore", False)}))
+        except Exception as e:
+            return _handle_error(e)
+
+    return await _cached_call(cache_key, run)
 
 
 @mcp.tool(name="oracle_ar_get_customer_summary")
 async def get_customer_summary(params: CustomerSummaryInput) -> str:
     """Get AR summary for a customer."""
-    auth_header = _build_auth_header(params.username, params.password)
-    try:
-        inv_data = await _make_request(params.base_url, auth_header, "receivablesInvoices", {"q": f"CustomerAccountId={params.customer_account_id}", "limit": 500})
-        invoices = inv_data.get("items", [])
-        total_invoiced = sum(inv.get("EnteredAmount") or 0 for inv in invoices)
-        total_balance = sum(inv.get("BalanceDue") or 0 for inv in invoices)
-        customer_name = invoices[0].get("BillToCustomerName") if invoices else None
-        return json.dumps({"customer_account_id": params.customer_account_id, "customer_name": customer_name, "total_invoiced": round(total_invoiced, 2), "outstanding_balance": round(total_balance, 2), "invoice_count": len(invoices)}, indent=2)
-    except Exception as e:
-        return _handle_error(e)
+    ctx = _request_context(params)
+    cache_key = _cache_key("oracle_ar_get_customer_summary", ctx, params)
+
+    async def run() -> str:
+        try:
+            return await _cache_set(cache_key, _dumps(await _customer_summary(ctx, params.customer_account_id)))
+        except Exception as e:
+            return _handle_error(e)
+
+    return await _cached_call(cache_key, run)
+
+
+@mcp.tool(name="oracle_ar_get_customer_summaries")
+async def get_customer_summaries(params: CustomerSummariesInput) -> str:
+    """Get AR summaries for several customers in one call."""
+    ctx = _request_context(params)
+    cache_key = _cache_key("oracle_ar_get_customer_summaries", ctx, params)
+
+    async def run() -> str:
+        # Bounds each batch so a large one cannot take over the process-wide _REQ_SEM queue.
+        batch_sem = asyncio.Semaphore(_SUMMARY_BATCH_CONCURRENCY)
+
+        async def summarize(customer_id: str) -> dict:
+            async with batch_sem:
+                try:
+                    return await _customer_summary(ctx, customer_id)
+                except Exception as e:
+                    return {"customer_account_id": customer_id, "error": _error_message(e)}
+
+        summaries = await asyncio.gather(*(summarize(customer_id) for customer_id in params.customer_account_ids))
+        result = _dumps({"summaries": summaries, "count": len(summaries)})
+        # Partial failures are returned but not cached, so a transient error is not replayed.
+        if any("error" in summary for summary in summaries):
+            return result
+        return await _cache_set(cache_key, result)
+
+    return await _cached_call(cache_key, run)
 
 
 @mcp.tool(name="oracle_ar_get_aging_summary")
 async def get_aging_summary(params: AgingInput) -> str:
     """Get aging summary of open invoices."""
-    auth_header = _build_auth_header(params.username, params.password)
-    query_params = {"limit": params.limit, "offset": params.offset}
-    if params.customer_account_id:
-        query_params["q"] = f"CustomerAccountId={params.customer_account_id}"
-    try:
-        data = await _make_request(params.base_url, auth_header, "receivablesInvoices", query_params)
-        today = date.today()
-        buckets = {"current": 0, "1_30": 0, "31_60": 0, "61_90": 0, "over_90": 0}
-        for inv in data.get("items", []):
-            balance = inv.get("BalanceDue") or 0
-            if balance <= 0:
-                continue
-            due_str = inv.get("DueDate")
-            if not due_str:
-                continue
-            try:
-                due = datetime.fromisoformat(due_str.replace("Z", "+00:00")).date()
-                days = (today - due).days
-                if days <= 0:
-                    buckets["current"] += balance
-                elif days <= 30:
-                    buckets["1_30"] += balance
-                elif days <= 60:
-                    buckets["31_60"] += balance
-                elif days <= 90:
-                    buckets["61_90"] += balance
-                else:
-                    buckets["over_90"] += balance
-            except:
-                pass
-        return json.dumps({"aging_buckets": {k: round(v, 2) for k, v in buckets.items()}, "total_outstanding": round(sum(buckets.values()), 2)}, indent=2)
-    except Exception as e:
-        return _handle_error(e)
+    ctx = _request_context(params)
+    cache_key = _cache_key("oracle_ar_get_aging_summary", ctx, params)
+
+    async def run() -> str:
+        query_params = _with_filters({"limit": params.limit, "offset": params.offset, "fields": "BalanceDue,DueDate"}, params, _AGING_FILTERS, "BalanceDue>0")
+        try:
+            balances = []
+            days_past_due = []
+            today = date.today().toordinal()
+            # Bound locally so the per-row loop avoids global and attribute lookups.
+            parse_date, add_balance, add_days = date.fromisoformat, balances.append, days_past_due.append
+            async for inv in _stream_items(ctx, "receivablesInvoices", query_params):
+                balance = inv.get("BalanceDue") or 0
+                if balance <= 0:
+                    continue
+                due_str = inv.get("DueDate")
+                if not due_str:
+                    continue
+                try:
+                    add_days(today - parse_date(due_str[:10]).toordinal())
+                except (ValueError, TypeError):
+                    continue
+                add_balance(balance)
+            days = np.array(days_past_due, dtype=np.int64)
+            bucket_idx = np.digitize(days, _AGING_BOUNDS)
+            totals = np.bincount(bucket_idx, weights=np.array(balances, dtype=np.float64), minlength=len(_AGING_BUCKETS))
+            counts = np.bincount(bucket_idx, minlength=len(_AGING_BUCKETS))
+            buckets = dict(zip(_AGING_BUCKETS, totals.tolist()))
+            return await _cache_set(cache_key, _dumps({"aging_buckets": {k: round(v, 2) for k, v in buckets.items()}, "invoice_counts": dict(zip(_AGING_BUCKETS, counts.tolist())), "total_outstanding": round(math.fsum(buckets.values()), 2)}))
+        except Exception as e:
+            return _handle_error(e)
+
+    return await _cached_call(cache_key, run)
 
 
 # ============================================================================
@@ -219,5 +626,6 @@ if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8000))
     
     app = mcp.sse_app()
+    app.router.lifespan_context = _with_client_shutdown(app.router.lifespan_context)
     
     uvicorn.run(app, host="0.0.0.0", port=port)
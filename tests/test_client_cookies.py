@@ -0,0 +1,33 @@
+import asyncio
+import importlib
+
+import httpx
+import pytest
+
+
+@pytest.mark.parametrize("module_name", ["server", "server_sse"])
+def test_pooled_clients_never_share_cookies(monkeypatch, module_name):
+    server = importlib.import_module(module_name)
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append((request.headers["Authorization"], request.headers.get("Cookie")))
+        session = request.headers["Authorization"][-8:]
+        return httpx.Response(200, json={"items": []}, headers={"Set-Cookie": f"JSESSIONID={session}; Path=/"})
+
+    monkeypatch.setattr(server.httpx, "AsyncHTTPTransport", lambda **_: httpx.MockTransport(handler))
+
+    async def call_as(username: str, password: str) -> None:
+        await server.test_connection(server.AuthInput(base_url="https://oracle.example.com", username=username, password=password))
+
+    async def run() -> None:
+        try:
+            await call_as("alice", "alice-password")
+            await call_as("mallory", "wrong-password")
+        finally:
+            await server._close_clients()
+
+    asyncio.run(run())
+    assert len(sent) == 2
+    assert sent[0][0] != sent[1][0]
+    assert [cookie for _, cookie in sent] == [None, None]